@@ -3,9 +3,9 @@ Dump TC2100 temperature readings to CSV
 """
 
 import argparse
+import io
 import sys
-import os
-from typing import TextIO
+from typing import BinaryIO, TextIO, Union
 
 from twisted.internet import reactor
 from twisted.internet.serialport import SerialPort
@@ -17,6 +17,15 @@ from tc2100.version import __version__ as version
 
 _APPLICATION_NAME = 'tc2100dump'
 
+_BATCH_SIZE = 16
+""" Number of CSV rows to write at once """
+
+_FLUSH_INTERVAL = 0.5
+""" Maximum time, in seconds, that a CSV row may be held before writing """
+
+_FILE_BUFFER_SIZE = 64 * 1024
+""" Size of the output file buffer, in bytes """
+
 
 def main():
     """ Run the program """
@@ -68,16 +77,13 @@ def run_dump_to_csv(port: str, file_name: str = None):
     """
 
     if not file_name or file_name == '-':
-        _make_stdout_linebuffered()
-        _run_dump(port, sys.stdout)
+        _run_dump(port, _binary_stdout())
         return
 
     with open(
             file_name,
-            mode='w',
-            newline='',
-            buffering=1,
-            encoding='utf-8') as outfile:
+            mode='wb',
+            buffering=_FILE_BUFFER_SIZE) as outfile:
         _run_dump(port, outfile)
 
 
@@ -89,18 +95,23 @@ def version_string() -> str:
     return f"{_APPLICATION_NAME} version {version}"
 
 
-def _make_stdout_linebuffered() -> None:
-    try:
-        sys.stdout.reconfigure(line_buffering=True)
-    except TypeError:
-        sys.stdout = os.fdopen(0, 'w', 1)
-    except AttributeError:
-        sys.stdout = os.fdopen(0, 'w', 1)
+def _binary_stdout() -> Union[BinaryIO, TextIO]:
+    # write to the underlying binary buffer and skip the text layer
+    # entirely. Unbuffered binary streams may write only part of each
+    # row, so use the text stream instead of those.
+    binary = getattr(sys.stdout, 'buffer', None)
+    if isinstance(binary, io.BufferedIOBase):
+        return binary
+    return sys.stdout
 
 
-def _run_dump(port: str, file_handle: TextIO) -> None:
-    SerialPort(ThermometerToCSVProtocol(file_handle=file_handle),
-               port, reactor, baudrate=9600)
+def _run_dump(port: str, file_handle: Union[BinaryIO, TextIO]) -> None:
+    protocol = ThermometerToCSVProtocol(file_handle=file_handle,
+                                        batch_size=_BATCH_SIZE,
+                                        flush_interval=_FLUSH_INTERVAL)
+    SerialPort(protocol, port, reactor, baudrate=9600)
+    reactor.addSystemEventTrigger(  # pylint: disable=no-member
+        'before', 'shutdown', protocol.flush)
     reactor.run()  # pylint: disable=no-member
 
 
@@ -0,0 +1,191 @@
+""" Vectorized decoding of recorded TC2100 streams
+
+:py:class:`~tc2100.ThermometerProtocol` decodes one message at a time,
+which is ideal for live data. To process a large recording of the serial
+stream all at once, use :py:func:`decode_frames`, which decodes every
+message in the buffer into a NumPy structured array.
+
+This module requires ``numpy``, which is installed with the ``numpy``
+extra:
+
+.. code-block:: bash
+
+   pip3 install tc2100[numpy]
+
+To decode a recording of the raw serial stream:
+
+.. code-block:: python
+
+   import tc2100.bulk
+
+   with open('capture.bin', 'rb') as recording:
+       observations, remainder = tc2100.bulk.decode_frames(recording.read())
+
+   print(observations['temperature_ch1'].mean())
+"""
+
+from typing import Tuple
+
+import numpy
+
+from tc2100.observation import Observation
+from tc2100.observation import _temperature_units, _thermocouple_types
+from tc2100.protocol import ThermometerProtocol
+
+
+OBSERVATION_DTYPE = numpy.dtype([
+    ('meter_time', 'm8[s]'),
+    ('thermocouple_type', 'u1'),
+    ('unit', 'u1'),
+    ('temperature_ch1', 'f8'),
+    ('temperature_ch2', 'f8'),
+])
+""" Record type of the arrays returned by :py:func:`decode_frames`
+
+``meter_time`` is the elapsed time since meter bootup. The
+``thermocouple_type`` and ``unit`` are the integer values of
+:py:class:`~tc2100.ThermocoupleType` and
+:py:class:`~tc2100.TemperatureUnit`. Invalid
+temperatures are NaN.
+"""
+
+
+# pylint: disable=protected-access
+_HEADER = ThermometerProtocol._header
+_TRAILER = ThermometerProtocol._trailer
+_FLAG_VALID = Observation._flag_valid
+_FLAG_NEGATIVE = Observation._flag_negative
+_MASK_LOWBYTE_ONLY = Observation._mask_lowbyte_only
+_MSGLEN = ThermometerProtocol._msglen
+# pylint: enable=protected-access
+_VALID_THERMOCOUPLE_TYPES = numpy.array(
+    [member is not None for member in _thermocouple_types])
+_VALID_UNITS = numpy.array(
+    [member is not None for member in _temperature_units])
+
+# layout of ThermometerProtocol._frame_format
+_FRAME = numpy.dtype({
+    'names': ['header', 'ch1', 'ch2', 'thermocouple_type', 'unit',
+              'ch1_flags', 'ch2_flags', 'hours', 'minutes', 'seconds',
+              'trailer'],
+    'formats': ['S2', '>i2', '>i2', 'u1', 'u1',
+                'u1', 'u1', 'u1', 'u1', 'u1',
+                'S2'],
+    'offsets': [0, 5, 7, 9, 10,
+                11, 12, 13, 14, 15,
+                16],
+    'itemsize': 18,
+})
+assert _FRAME.itemsize == _MSGLEN
+
+
+def decode_frames(octets: bytes) -> Tuple[numpy.ndarray, bytes]:
+    """ Decode all messages in a buffer
+
+    Like :py:class:`~tc2100.ThermometerProtocol`, this function
+    synchronizes to message boundaries and skips over any bytes which do
+    not form a valid message.
+
+    :param octets: Serial data stream, which may begin and end in the
+           middle of a message
+    :return: Tuple of the decoded observations, as an array of
+             :py:data:`OBSERVATION_DTYPE`, and the trailing bytes which
+             did not yet form a complete message
+    """
+    raw = numpy.frombuffer(octets, dtype='u1')
+    size = _FRAME.itemsize
+    starts = _frame_starts(raw)
+    if len(starts):
+        frames = raw[starts[:, None] + numpy.arange(size)]
+        observations = _convert(frames.reshape(-1).view(_FRAME))
+        end = int(starts[-1]) + size
+    else:
+        observations = numpy.empty(0, dtype=OBSERVATION_DTYPE)
+        end = 0
+
+    return observations, octets[_remainder_start(octets, end):]
+
+
+def _remainder_start(octets: bytes, pos: int) -> int:
+    """ Find where the framing detector would stop discarding bytes
+
+    Every complete message at or after `pos` is known to be invalid, so
+    the framing detector in :py:class:`ThermometerProtocol` would step
+    past each header that begins one. It stops at the first header which
+    is too short to be a message, or once less than a message remains.
+    """
+    last = len(octets) - _FRAME.itemsize
+    if pos > last:
+        return pos
+
+    header = octets.rfind(_HEADER, pos, last + len(_HEADER))
+    if header >= 0:
+        pos = header + 1
+        if pos > last:
+            return pos
+
+    pos = octets.find(_HEADER, pos)
+    if pos < 0:
+        # keep a trailing partial header, if any
+        pos = len(octets) - len(_HEADER) + 1
+    return pos
+
+
+def _frame_starts(raw: numpy.ndarray) -> numpy.ndarray:
+    """ Find the offset of every message in the stream
+
+    All positions where a valid message could begin are found at once.
+    Then, like the framing detector in :py:class:`ThermometerProtocol`,
+    the first candidate is taken and any candidates which overlap it are
+    skipped.
+    """
+    size = _FRAME.itemsize
+    count = len(raw) - size + 1
+    if count <= 0:
+        return numpy.empty(0, dtype=numpy.intp)
+
+    candidates = numpy.flatnonzero(
+        _is_valid(numpy.lib.stride_tricks.as_strided(
+            raw, shape=(count, size), strides=(1, 1),
+            writeable=False).view(_FRAME)[:, 0]))
+    if len(candidates) < 2 or numpy.all(numpy.diff(candidates) >= size):
+        return candidates
+
+    starts = []
+    following = 0
+    for start in candidates.tolist():
+        if start >= following:
+            starts.append(start)
+            following = start + size
+    return numpy.array(starts, dtype=numpy.intp)
+
+
+def _is_valid(frames: numpy.ndarray) -> numpy.ndarray:
+    return ((frames['header'] == _HEADER) &
+            (frames['trailer'] == _TRAILER) &
+            _VALID_THERMOCOUPLE_TYPES[frames['thermocouple_type'] &
+                                      _MASK_LOWBYTE_ONLY] &
+            _VALID_UNITS[frames['unit'] & _MASK_LOWBYTE_ONLY])
+
+
+def _convert(frames: numpy.ndarray) -> numpy.ndarray:
+    out = numpy.empty(len(frames), dtype=OBSERVATION_DTYPE)
+    out['meter_time'] = (frames['hours'].astype('i8') * 3600 +
+                         frames['minutes'].astype('i8') * 60 +
+                         frames['seconds'])
+    out['thermocouple_type'] = (frames['thermocouple_type'] &
+                                _MASK_LOWBYTE_ONLY)
+    out['unit'] = frames['unit'] & _MASK_LOWBYTE_ONLY
+    out['temperature_ch1'] = _decode_temperature(frames['ch1'],
+                                                 frames['ch1_flags'])
+    out['temperature_ch2'] = _decode_temperature(frames['ch2'],
+                                                 frames['ch2_flags'])
+    return out
+
+
+def _decode_temperature(values: numpy.ndarray,
+                        flags: numpy.ndarray) -> numpy.ndarray:
+    temperature = values / 10.0
+    temperature = numpy.where(flags & _FLAG_NEGATIVE,
+                              -temperature, temperature)
+    return numpy.where(flags & _FLAG_VALID, temperature, numpy.nan)
@@ -3,9 +3,40 @@
 import enum
 import math
 from struct import Struct
+from time import monotonic_ns
 from datetime import datetime
+from datetime import timedelta
 from datetime import timezone
-from typing import Tuple, NamedTuple
+from typing import Callable, Sequence, Tuple, NamedTuple
+
+
+_now = datetime.now
+_UTC = timezone.utc
+
+
+class _AnchoredClock:  # pylint: disable=too-few-public-methods
+    """ UTC clock which reads the real-time clock at most once per interval
+
+    Between reads, the time is advanced from the monotonic clock. This is
+    cheaper than querying the real-time clock for every message.
+    """
+    __slots__ = ('_interval_ns', '_anchor_mono', '_anchor_wall')
+
+    def __init__(self, interval_ns: int = 1_000_000_000):
+        self._interval_ns = interval_ns
+        self._anchor_mono = monotonic_ns()
+        self._anchor_wall = _now(_UTC)
+
+    def __call__(self) -> datetime:
+        elapsed = monotonic_ns() - self._anchor_mono
+        if elapsed > self._interval_ns:
+            self._anchor_mono += elapsed
+            self._anchor_wall = _now(_UTC)
+            return self._anchor_wall
+        return self._anchor_wall + timedelta(microseconds=elapsed // 1000)
+
+
+_system_time = _AnchoredClock()
 
 
 @enum.unique
@@ -78,6 +109,19 @@ class ThermocoupleType(enum.IntEnum):
         return str(self.name)
 
 
+def _nibble_table(enumeration) -> Tuple:
+    """ Tabulate enumeration members by value, for every value of a nibble
+
+    Values which are not members of the enumeration map to `None`.
+    """
+    members = {int(member): member for member in enumeration}
+    return tuple(members.get(value) for value in range(16))
+
+
+_thermocouple_types = _nibble_table(ThermocoupleType)
+_temperature_units = _nibble_table(TemperatureUnit)
+
+
 class MeterTime(NamedTuple):
     """ Elapsed time indication from the thermometer
 
@@ -102,6 +146,9 @@ class MeterTime(NamedTuple):
     seconds: int
 
     _format = Struct("!3B")
+    _pack = _format.pack
+    _unpack_from = _format.unpack_from
+    _size = _format.size
 
     def __str__(self):
         return f"{self.hours:03d}:{self.minutes:02d}:{self.seconds:02d}"
@@ -111,17 +158,18 @@ class MeterTime(NamedTuple):
 
         :return: Packed byte representation of this MeterTime
         """
-        return self._format.pack(self.hours, self.minutes, self.seconds)
+        return MeterTime._pack(self.hours, self.minutes, self.seconds)
 
     @classmethod
-    def from_bytes(cls, octets: bytes) -> 'MeterTime':
+    def from_bytes(cls, octets: bytes, offset: int = 0) -> 'MeterTime':
         """ Convert from wireline representation
 
         :param octets: Packed byte representation of this message
+        :param offset: Position of the message within `octets`
         :return: A decoded time. An exception is thrown if the decoding
                  fails.
         """
-        return MeterTime(*cls._format.unpack(octets))
+        return MeterTime(*MeterTime._unpack_from(octets, offset))
 
     @classmethod
     def size(cls) -> int:
@@ -130,26 +178,27 @@ class MeterTime(NamedTuple):
         :return: Size of the packed bytes generated by
                  :py:meth:`MeterTime.to_bytes`
         """
-        return cls._format.size
+        return MeterTime._size
 
 
-class Observation(NamedTuple):
+class Observation:
     """ Temperature observation message from the thermometer
 
     Observations are time-tagged in Python, using the current value of the
     system's real-time clock, when they are converted :py:meth:`from_bytes()`.
     Otherwise, an Observation contains only data output by the thermometer.
 
+    .. versionchanged:: 0.2.0
+
+       Observation is no longer a ``NamedTuple``. Its fields are mutable
+       attributes, and instances can no longer be indexed, unpacked, or
+       hashed. Use :py:meth:`as_dict` or the named attributes instead.
+
     .. py:attribute:: system_time
 
         Time, according to the system clock, when this Observation was
         de-serialized. Always a timezone-aware `datetime` in the UTC time zone.
 
-    .. py:attribute:: meter_time
-
-        Time, according to the meter, that the temperature measurement was
-        taken.
-
     .. py:attribute:: thermocouple_type
 
         Thermocouple type used to make this measurement.
@@ -171,14 +220,12 @@ class Observation(NamedTuple):
         invalid.
     """
 
-    system_time: datetime or None
-    meter_time: MeterTime or None
-    thermocouple_type: ThermocoupleType or str
-    unit: TemperatureUnit or str
-    temperature_ch1: float
-    temperature_ch2: float
+    __slots__ = ('system_time', '_meter_time', 'thermocouple_type', 'unit',
+                 'temperature_ch1', 'temperature_ch2')
+
+    _fields = ('system_time', 'meter_time', 'thermocouple_type', 'unit',
+               'temperature_ch1', 'temperature_ch2')
 
-    _num_channels = 2
     _flag_valid = 0x08
     _flag_invalid = 0x40
     _flag_negative = 0x80
@@ -192,7 +239,51 @@ class Observation(NamedTuple):
         "B"     # thermocouple type (enumerated)
         "B"     # display unit (enumerated)
         "2B"    # channel validity / status flags
+        "3B"    # meter time: hours, minutes, seconds
     )
+    _pack = _format.pack
+    _unpack_from = _format.unpack_from
+    _size = _format.size
+
+    # pylint: disable-next=too-many-arguments,too-many-positional-arguments
+    def __init__(self,
+                 system_time: datetime or None,
+                 meter_time: MeterTime or None,
+                 thermocouple_type: ThermocoupleType or str,
+                 unit: TemperatureUnit or str,
+                 temperature_ch1: float,
+                 temperature_ch2: float):
+        self.system_time = system_time
+        self._meter_time = meter_time
+        self.thermocouple_type = thermocouple_type
+        self.unit = unit
+        self.temperature_ch1 = temperature_ch1
+        self.temperature_ch2 = temperature_ch2
+
+    def __eq__(self, other):
+        if not isinstance(other, Observation):
+            return NotImplemented
+        return self._astuple() == other._astuple()
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}"
+                           for name in self._fields)
+        return f"Observation({fields})"
+
+    @property
+    def meter_time(self) -> MeterTime or None:
+        """ Time, according to the meter, that the temperature measurement
+        was taken
+        """
+        meter_time = self._meter_time
+        if meter_time is not None and not isinstance(meter_time, MeterTime):
+            # decoded as a plain (hours, minutes, seconds) tuple
+            meter_time = self._meter_time = MeterTime(*meter_time)
+        return meter_time
+
+    @meter_time.setter
+    def meter_time(self, meter_time: MeterTime or None):
+        self._meter_time = meter_time
 
     @property
     def temperatures(self) -> Tuple[float, float]:
@@ -207,57 +298,120 @@ class Observation(NamedTuple):
 
         :return: This Observation, expressed as a mutable dict.
         """
-        return self._asdict()  # pylint: disable=no-member
+        return {name: getattr(self, name) for name in self._fields}
+
+    def to_csv_row(self) -> str:
+        """ Convert to CSV
+
+        :return: This Observation, expressed as one CRLF-terminated row of
+                 CSV with the columns in :py:meth:`field_names` order.
+                 Empty fields are written as empty strings.
+        """
+        return ','.join('' if value is None else str(value)
+                        for value in self._astuple()) + '\r\n'
 
     def to_bytes(self) -> bytes:
         """ Convert to wireline representation
 
         The conversion will be lossy if, for example, the channel temperatures
-        are not evenly divisible by 0.1.
+        are not evenly divisible by 0.1. Temperatures are rounded to the
+        nearest 0.1, with halves rounded away from zero.
 
         :return: Packed byte representation of this Observation
         """
-        out_fields = []
-        out_fields.extend([self._encode_temperature_value(v)
-                           for v in self.temperatures])
+        value1, flag1 = self._encode_temperature(self.temperature_ch1)
+        value2, flag2 = self._encode_temperature(self.temperature_ch2)
+
         if isinstance(self.thermocouple_type, str):
             thermtype = ThermocoupleType[self.thermocouple_type]
         else:
             thermtype = self.thermocouple_type
-        out_fields.append(int(thermtype))
 
         if isinstance(self.unit, str):
             unit = TemperatureUnit[self.unit]
         else:
             unit = self.unit
-        out_fields.append(int(unit) | 0x80)
-
-        out_fields.extend([self._encode_temperature_flag(v)
-                           for v in self.temperatures])
 
-        meter_time = self.meter_time or self._tzero
-        return self._format.pack(*out_fields) + meter_time.to_bytes()
+        hours, minutes, seconds = self._meter_time or self._tzero
+        return Observation._pack(value1, value2,
+                                 int(thermtype), int(unit) | 0x80,
+                                 flag1, flag2,
+                                 hours, minutes, seconds)
 
     @classmethod
-    def from_bytes(cls, octets: bytes) -> 'Observation':
+    def from_bytes(cls, octets: bytes, offset: int = 0,
+                   system_time_fn: Callable[[], datetime] = _system_time
+                   ) -> 'Observation':
         """ Convert from wireline representation
 
+        The message is read in place, so `octets` may be a larger buffer
+        (or a `memoryview` of one) which holds the message at `offset`.
+
         :param octets: Packed byte representation of this message
+        :param offset: Position of the message within `octets`
+        :param system_time_fn: Clock used to set the `system_time`. It must
+               return a timezone-aware `datetime`. The default clock is
+               accurate to the system's real-time clock within about a
+               second.
+        :return: A decoded message. An exception is thrown if the decoding
+                 fails.
+        """
+        return cls.from_fields(Observation._unpack_from(octets, offset),
+                               system_time_fn)
+
+    @classmethod
+    def from_fields(cls, fields: Sequence[int],
+                    system_time_fn: Callable[[], datetime] = _system_time
+                    ) -> 'Observation':
+        """ Convert from unpacked wireline representation
+
+        This is useful when the caller has already unpacked the message
+        with ``struct``, possibly as part of a larger record.
+
+        :param fields: The nine fields of the message, as unpacked by the
+               ``struct`` format ``!2hBB2B3B``
+        :param system_time_fn: Clock used to set the `system_time`
         :return: A decoded message. An exception is thrown if the decoding
                  fails.
         """
-        meter_time = MeterTime.from_bytes(octets[-3:])
-        decode = cls._format.unpack(octets[0:-3])
-        therm_type = ThermocoupleType(decode[2] & cls._mask_lowbyte_only)
-        display_unit = TemperatureUnit(decode[3] & cls._mask_lowbyte_only)
-        temperatures = [cls._decode_temperature(decode[i], decode[i + 4])
-                        for i in range(0, cls._num_channels)]
-        return Observation(datetime.now(timezone.utc),
-                           meter_time,
-                           therm_type,
-                           display_unit,
-                           temperatures[0],
-                           temperatures[1])
+        return Observation(system_time_fn(), *cls._decode(fields))
+
+    @classmethod
+    def csv_row_from_bytes(cls, octets: bytes, offset: int = 0,
+                           system_time_fn: Callable[[], datetime] =
+                           _system_time) -> str:
+        """ Convert from wireline representation directly to CSV
+
+        This is equivalent to ``from_bytes(...).to_csv_row()``, but it does
+        not construct an Observation.
+
+        :param octets: Packed byte representation of this message
+        :param offset: Position of the message within `octets`
+        :param system_time_fn: Clock used to set the `system_time`
+        :return: A CSV row, as for :py:meth:`to_csv_row`. An exception is
+                 thrown if the decoding fails.
+        """
+        fields = Observation._unpack_from(octets, offset)
+        return cls.csv_row_from_fields(fields, system_time_fn)
+
+    @classmethod
+    def csv_row_from_fields(cls, fields: Sequence[int],
+                            system_time_fn: Callable[[], datetime] =
+                            _system_time) -> str:
+        """ Convert from unpacked wireline representation directly to CSV
+
+        :param fields: The nine fields of the message, as for
+               :py:meth:`from_fields`
+        :param system_time_fn: Clock used to set the `system_time`
+        :return: A CSV row, as for :py:meth:`to_csv_row`. An exception is
+                 thrown if the decoding fails.
+        """
+        (hours, minutes, seconds), therm_type, display_unit, \
+            temperature_ch1, temperature_ch2 = cls._decode(fields)
+        return (f"{system_time_fn()},"
+                f"{hours:03d}:{minutes:02d}:{seconds:02d},"
+                f"{therm_type.name},{display_unit.name},"
+                f"{temperature_ch1!r},{temperature_ch2!r}\r\n")
 
     @classmethod
     def size(cls) -> int:
@@ -266,7 +420,7 @@ class Observation(NamedTuple):
         :return Size of the packed byte representation of an Observation,
                 as generated by :py:meth:`Observation.to_bytes`
         """
-        return cls._format.size + MeterTime.size()
+        return Observation._size
 
     @classmethod
     def field_names(cls) -> Tuple:
@@ -287,17 +441,27 @@ class Observation(NamedTuple):
         return math.nan
 
     @classmethod
-    def _encode_temperature_value(cls, temperature) -> int:
-        if not math.isfinite(temperature):
-            return cls._invalid_placeholder
-        return int(math.fabs(temperature) * 10)
+    def _decode(cls, decode: Sequence[int]) -> Tuple:
+        therm_type = _thermocouple_types[decode[2] & cls._mask_lowbyte_only]
+        if therm_type is None:
+            raise ValueError(f"unknown thermocouple type {decode[2]:#04x}")
+        display_unit = _temperature_units[decode[3] & cls._mask_lowbyte_only]
+        if display_unit is None:
+            raise ValueError(f"unknown temperature unit {decode[3]:#04x}")
+        return (decode[6:9],
+                therm_type,
+                display_unit,
+                cls._decode_temperature(decode[0], decode[4]),
+                cls._decode_temperature(decode[1], decode[5]))
+
+    def _astuple(self) -> Tuple:
+        return tuple(getattr(self, name) for name in self._fields)
 
     @classmethod
-    def _encode_temperature_flag(cls, temperature) -> int:
+    def _encode_temperature(cls, temperature) -> Tuple[int, int]:
         if not math.isfinite(temperature):
-            return cls._flag_invalid
-
-        flag = cls._flag_valid
+            return cls._invalid_placeholder, cls._flag_invalid
         if temperature < 0:
-            flag |= cls._flag_negative
-        return flag
+            return (int(-temperature * 10 + 0.5),
+                    cls._flag_valid | cls._flag_negative)
+        return int(temperature * 10 + 0.5), cls._flag_valid
@@ -4,11 +4,14 @@ To use the Protocol, subclass :py:class:`ThermometerProtocol` and implement
 its ``observation_received()`` method to handle messages.
 """
 from abc import abstractmethod
-from typing import TextIO
-from csv import DictWriter
-import struct
+from contextlib import closing
+from typing import BinaryIO, Callable, Iterator, TextIO, Tuple, Union
+import io
+from struct import Struct
 
+from twisted.internet.interfaces import IReactorTime
 from twisted.internet.protocol import Protocol
+from twisted.internet.task import LoopingCall
 
 from tc2100.observation import Observation
 
@@ -24,8 +27,14 @@ class ThermometerProtocol(Protocol):
     _num_padbytes = 3
     _trailer = b"\x0d\x0a"
     _msglen = 2 + 3 + 2 + Observation.size()
-    _data_start = 2 + 3
-    _data_len = Observation.size()
+    _trailer_start = _msglen - len(_trailer)
+    _frame_format = Struct(
+        "!"
+        "2s"         # header
+        "3x"         # padding
+        "2hBB2B3B"   # Observation fields
+        "2s"         # trailer
+    )
 
     def __init__(self):
         super().__init__()
@@ -39,60 +48,191 @@ class ThermometerProtocol(Protocol):
         """
 
     def dataReceived(self, data: bytes) -> None:
-        self._buf += data
-
-        while self._framing_detector():
-            try:
-                msg = Observation.from_bytes(
-                    self._buf[self._data_start:self._data_start +
-                              self._data_len])
-                self._buf = self._buf[self._msglen:]
-            except (ValueError, struct.error):
-                # if we failed to decode, our framing is off
-                self._buf = self._buf[1:]
-                continue
-
-            self.observation_received(msg)
+        with closing(self._iter_decoded(data, Observation.from_fields)) \
+                as observations:
+            for msg in observations:
+                self.observation_received(msg)
 
     def connectionLost(self, reason=None):
         self._buf = b""
 
-    def _framing_detector(self) -> bool:
+    def _iter_decoded(self, data: bytes,
+                      decode: Callable[[Tuple], object]) -> Iterator:
+        """ Decode all complete messages in the buffer
+
+        Messages are decoded lazily, one per iteration. When the iterator
+        is exhausted or closed, the buffer is trimmed to the data which
+        has not been consumed.
+
+        Once the framing detector finds a message, all of the complete
+        messages which follow it are unpacked in a single pass. If any of
+        them turns out to be misframed, the framing detector takes over
+        again from that point.
+
+        :param data: Newly-received bytes to append to the buffer
+        :param decode: Decoder, like :py:meth:`Observation.from_fields`,
+               which is called with the unpacked fields of each message
+        """
+        self._buf += data
+        pos = 0
+        try:
+            while True:
+                found, pos = self._framing_detector(pos)
+                if not found:
+                    return
+
+                count = (len(self._buf) - pos) // self._msglen
+                frames = memoryview(self._buf)[pos:pos + count * self._msglen]
+                for frame in self._frame_format.iter_unpack(frames):
+                    if frame[0] != self._header or frame[-1] != self._trailer:
+                        break
+
+                    try:
+                        msg = decode(frame[1:-1])
+                    except ValueError:
+                        # if we failed to decode, our framing is off
+                        pos += 1
+                        break
+
+                    pos += self._msglen
+                    yield msg
+        finally:
+            self._buf = self._buf[pos:]
+
+    def _framing_detector(self, pos: int) -> Tuple[bool, int]:
         """ Perform message boundary detection
 
         Serial protocols lack inherent framing---divisions between message
         boundaries. Reads might begin in the middle of a message. This
-        method synchronizes to the message boundary by advancing `octets`
-        until the start of message is found.
+        method synchronizes to the message boundary by searching the buffer
+        for the next start of message.
 
-        :param data: bytes which may contain a message, not necessarily at
-               start
+        :param pos: Position in the buffer at which to begin searching
+        :return: ``(True, start)`` if a complete message begins at
+                 ``start``. Otherwise, ``(False, start)``, where everything
+                 before ``start`` may be discarded.
         """
 
-        while len(self._buf) >= self._msglen:
-            dstart = self._buf[0:len(self._header)]
-            dend = self._buf[self._msglen-len(self._trailer):self._msglen]
-            if dstart == self._header and dend == self._trailer:
-                return True
+        buf = self._buf
+        while len(buf) - pos >= self._msglen:
+            start = buf.find(self._header, pos)
+            if start < 0:
+                # keep a trailing partial header, if any
+                return False, max(pos, len(buf) - len(self._header) + 1)
+
+            pos = start
+            if len(buf) - pos < self._msglen:
+                break
 
-            self._buf = self._buf[1:]
+            if buf.startswith(self._trailer, pos + self._trailer_start):
+                return True, pos
 
-        return False
+            pos += 1
+
+        return False, pos
 
 
 class ThermometerToCSVProtocol(ThermometerProtocol):
     """ Output thermometer measurements as CSV
 
+    Rows are written in batches of `batch_size`. Writing a batch does not
+    flush the `file_handle`, so buffered files cost no system call per
+    batch. If a `flush_interval` is given, any pending rows are written
+    and the `file_handle` is flushed that often while the connection is
+    up, so the file never lags far behind the meter. Both also happen when
+    the connection is lost, or when :py:meth:`flush` is called.
+
+    Rows are normally formatted straight from the received bytes, without
+    constructing an :py:class:`Observation`. Subclasses which override
+    :py:meth:`observation_received` receive each Observation as usual, at
+    the cost of this optimization.
+
     .. py:attribute:: file_handle
 
-        An open text stream where output will be written. Files must be
-        opened with the ``newline=''`` option.
+        An open stream where output will be written. Buffered binary
+        streams are preferred, since they skip Python's text encoding
+        layer; rows are written as ASCII. Unbuffered binary streams, like
+        files opened with ``buffering=0``, are not supported. Text streams
+        must be opened with the ``newline=''`` option.
+
+    .. py:attribute:: batch_size
+
+        Number of rows to accumulate before writing them. The default
+        writes every row as soon as it is received.
+
+    .. py:attribute:: flush_interval
+
+        Maximum time, in seconds, that a row may wait before it is written.
+        Omit to write only on full batches.
+
+    .. py:attribute:: clock
+
+        Clock which schedules the `flush_interval`. Defaults to the global
+        reactor.
     """
-    def __init__(self, file_handle: TextIO):
+    def __init__(self, file_handle: Union[BinaryIO, TextIO],
+                 batch_size: int = 1, flush_interval: float = None,
+                 clock: IReactorTime = None):
         super().__init__()
-        self._writer = DictWriter(file_handle,
-                                  fieldnames=Observation.field_names())
-        self._writer.writeheader()
+        self._file_handle = file_handle
+        self._binary = isinstance(file_handle, io.BufferedIOBase)
+        self._write(','.join(Observation.field_names()) + '\r\n')
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._clock = clock
+        self._flusher = None
+        self._pending = []
+
+    def connectionMade(self):
+        super().connectionMade()
+        if self._flush_interval:
+            self._flusher = LoopingCall(self.flush)
+            if self._clock is not None:
+                self._flusher.clock = self._clock
+            self._flusher.start(self._flush_interval, now=False)
+
+    def connectionLost(self, reason=None):
+        if self._flusher is not None and self._flusher.running:
+            self._flusher.stop()
+        self._flusher = None
+        self.flush()
+        super().connectionLost(reason)
+
+    def dataReceived(self, data: bytes) -> None:
+        if (type(self).observation_received is not
+                ThermometerToCSVProtocol.observation_received):
+            super().dataReceived(data)
+            return
+
+        # rows are formatted straight from the wire, without building
+        # an Observation for each one
+        with closing(self._iter_decoded(data,
+                                        Observation.csv_row_from_fields)) \
+                as rows:
+            for row in rows:
+                self._row_received(row)
 
     def observation_received(self, observation: Observation) -> None:
-        self._writer.writerow(observation.as_dict())
+        self._row_received(observation.to_csv_row())
+
+    def flush(self) -> None:
+        """ Write all pending rows to the `file_handle`, and flush it """
+        self._write_pending()
+        self._file_handle.flush()
+
+    def _write_pending(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        self._write(''.join(pending))
+
+    def _write(self, text: str) -> None:
+        if self._binary:
+            self._file_handle.write(text.encode('ascii'))
+        else:
+            self._file_handle.write(text)
+
+    def _row_received(self, row: str) -> None:
+        self._pending.append(row)
+        if len(self._pending) >= self._batch_size:
+            self._write_pending()
@@ -1,6 +1,6 @@
 """ Version and Packaging Information """
 
-__version__ = '0.1.5'
+__version__ = '0.2.0'
 __author__ = 'Colin S.'
 __copyright__ = "Copyright 2020, Colin S."
 __license__ = 'MIT'
@@ -28,3 +28,5 @@ FRAMING_BAD_HEADER = b"\x00\x65\x14" + BOTH_K
 FRAMING_TRAIL_HEADER = BOTH_K + b"\x65\x14\xFF"
 
 FRAMING_TWOMSGS = BOTH_K + BOTH_K
+
+FRAMING_NOISE = b"\x65" * 64 + b"\x00" * 64 + BOTH_K
@@ -0,0 +1,69 @@
+import math
+import timeit
+
+import pytest
+
+from tc2100.observation import Observation, ThermocoupleType, TemperatureUnit
+
+from . import datastrings
+
+numpy = pytest.importorskip("numpy")
+bulk = pytest.importorskip("tc2100.bulk")
+
+
+def test_decode_empty():
+    obs, rest = bulk.decode_frames(b"")
+    assert len(obs) == 0
+    assert rest == b""
+
+
+def test_decode_framing():
+    stream = (datastrings.FRAMING_NOISE + datastrings.BAD_UNIT +
+              datastrings.FRAMING_BAD_HEADER + datastrings.NEGATIVE_14P1 +
+              datastrings.FRAMING_TRAIL_HEADER)
+    obs, rest = bulk.decode_frames(stream)
+
+    assert len(obs) == 4
+    assert rest == b"\x65\x14\xFF"
+    assert obs[0]['temperature_ch1'] == datastrings.BOTH_K_CH1
+    assert obs[0]['temperature_ch2'] == datastrings.BOTH_K_CH2
+    assert obs[0]['unit'] == TemperatureUnit.K
+    assert obs[2]['temperature_ch1'] == -14.1
+    assert math.isnan(obs[2]['temperature_ch2'])
+
+
+def test_decode_matches_observation():
+    stream = (datastrings.NO_DATA + datastrings.CH1 + datastrings.CH2 +
+              datastrings.BOTH)
+    obs, rest = bulk.decode_frames(stream)
+
+    assert len(obs) == 4
+    assert rest == b""
+    for i, frame in enumerate((datastrings.NO_DATA, datastrings.CH1,
+                               datastrings.CH2, datastrings.BOTH)):
+        msg = Observation.from_bytes(frame, 5)
+        assert ThermocoupleType(obs[i]['thermocouple_type']) == \
+            msg.thermocouple_type
+        assert TemperatureUnit(obs[i]['unit']) == msg.unit
+        numpy.testing.assert_equal(obs[i]['temperature_ch1'],
+                                   msg.temperature_ch1)
+        numpy.testing.assert_equal(obs[i]['temperature_ch2'],
+                                   msg.temperature_ch2)
+        mt = msg.meter_time
+        assert obs[i]['meter_time'] == numpy.timedelta64(
+            mt.hours * 3600 + mt.minutes * 60 + mt.seconds, 's')
+
+
+def test_decode_misframed_is_linear():
+    # drop the last byte of every fifth message
+    group = (datastrings.BOTH_K * 5)[:-1]
+    elapsed = []
+    for groups in (1000, 4000):
+        stream = group * groups
+        obs, _ = bulk.decode_frames(stream)
+        assert len(obs) == 4 * groups
+        elapsed.append(min(timeit.repeat(
+            lambda: bulk.decode_frames(stream), number=1, repeat=5)))
+
+    # linear is 4x; quadratic resynchronization would be 16x
+    assert elapsed[1] < 8 * elapsed[0]
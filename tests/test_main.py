@@ -1,5 +1,8 @@
+import io
+import sys
+
 from tc2100.__main__ import version_string, get_arg_parser, \
-    _make_stdout_linebuffered
+    _binary_stdout
 
 
 def test_version_string():
@@ -10,5 +13,15 @@ def test_arg_parser():
     get_arg_parser()
 
 
-def test_make_stdout_unbuffered():
-    _make_stdout_linebuffered()
+def test_binary_stdout(monkeypatch, tmp_path):
+    stdout = io.TextIOWrapper(io.BytesIO())
+    monkeypatch.setattr(sys, 'stdout', stdout)
+    assert _binary_stdout() is stdout.buffer
+
+    textonly = io.StringIO()
+    monkeypatch.setattr(sys, 'stdout', textonly)
+    assert _binary_stdout() is textonly
+
+    with io.TextIOWrapper(io.FileIO(tmp_path / "out.csv", 'w')) as raw:
+        monkeypatch.setattr(sys, 'stdout', raw)
+        assert _binary_stdout() is raw
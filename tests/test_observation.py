@@ -1,4 +1,8 @@
+import csv
+import io
 import math
+import pytest
+from datetime import datetime, timedelta, timezone
 
 from tc2100.observation import Observation, ThermocoupleType, TemperatureUnit,\
     MeterTime
@@ -73,6 +77,78 @@ def test_decode_negative_temperature():
     assert msg2.temperature_ch1 == -14.1
 
 
+def test_decode_at_offset():
+    msg = Observation.from_bytes(memoryview(datastrings.BOTH_K), 5)
+    assert msg.temperatures[0] == datastrings.BOTH_K_CH1
+    assert msg.temperatures[1] == datastrings.BOTH_K_CH2
+    assert msg.unit == TemperatureUnit.K
+    assert str(msg.meter_time) == "000:02:34"
+
+
+def test_decode_system_time():
+    msg = Observation.from_bytes(datastrings.BOTH_K[5:5+11])
+    delta = msg.system_time - datetime.now(timezone.utc)
+    assert abs(delta) < timedelta(seconds=2)
+
+    fixed = datetime(2020, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    msg = Observation.from_bytes(datastrings.BOTH_K[5:5+11],
+                                 system_time_fn=lambda: fixed)
+    assert msg.system_time == fixed
+
+
+def test_encode_rounding():
+    msg = Observation(temperature_ch1=0.7 * 3,
+                      temperature_ch2=-0.7 * 3,
+                      unit='C', thermocouple_type='K',
+                      meter_time=None, system_time=None)
+    inp = Observation.from_bytes(msg.to_bytes())
+
+    assert inp.temperature_ch1 == 2.1
+    assert inp.temperature_ch2 == -2.1
+
+    msg = Observation(temperature_ch1=0.25,
+                      temperature_ch2=-0.25,
+                      unit='C', thermocouple_type='K',
+                      meter_time=None, system_time=None)
+    inp = Observation.from_bytes(msg.to_bytes())
+
+    assert inp.temperature_ch1 == 0.3
+    assert inp.temperature_ch2 == -0.3
+
+
+def test_decode_bad_unit():
+    with pytest.raises(ValueError):
+        Observation.from_bytes(datastrings.BAD_UNIT, 5)
+
+
+def test_fields():
+    fixed = datetime(2020, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    msg = Observation.from_bytes(datastrings.BOTH, 5, lambda: fixed)
+    msg2 = Observation.from_bytes(datastrings.BOTH, 5, lambda: fixed)
+
+    assert msg == msg2
+    assert tuple(msg.as_dict().keys()) == Observation.field_names()
+    assert repr(msg).startswith("Observation(system_time=")
+    assert not hasattr(msg, '__dict__')
+
+
+def test_csv_row():
+    fixed = datetime(2020, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    for frame in (datastrings.NO_DATA, datastrings.BOTH_K,
+                  datastrings.NEGATIVE_14P1):
+        msg = Observation.from_bytes(frame, 5, lambda: fixed)
+        expect = io.StringIO()
+        writer = csv.DictWriter(expect, fieldnames=Observation.field_names())
+        writer.writerow(msg.as_dict())
+
+        assert msg.to_csv_row() == expect.getvalue()
+        assert Observation.csv_row_from_bytes(frame, 5, lambda: fixed) == \
+            expect.getvalue()
+
+    with pytest.raises(ValueError):
+        Observation.csv_row_from_bytes(datastrings.BAD_UNIT, 5)
+
+
 def test_decode_reencode():
     msg = Observation.from_bytes(datastrings.BOTH[5:5+11])
 
@@ -1,5 +1,8 @@
 import io
 
+import pytest
+from twisted.internet.task import Clock
+
 from tc2100.protocol import ThermometerProtocol, ThermometerToCSVProtocol
 from tc2100.observation import Observation
 
@@ -53,6 +56,19 @@ def test_framing_trail_header():
     assert buf.messages[0].temperatures[1] == datastrings.BOTH_K_CH2
 
 
+def test_framing_noise():
+    buf = BufferingThermProto()
+    buf.dataReceived(datastrings.FRAMING_NOISE[:-1])
+
+    assert len(buf.messages) == 0
+    assert len(buf._buf) < len(datastrings.FRAMING_NOISE)
+
+    buf.dataReceived(datastrings.FRAMING_NOISE[-1:])
+    assert len(buf.messages) == 1
+    assert len(buf._buf) == 0
+    assert buf.messages[0].temperatures[0] == datastrings.BOTH_K_CH1
+
+
 def test_framing_two_messages():
     buf = BufferingThermProto()
     buf.dataReceived(datastrings.FRAMING_TWOMSGS)
@@ -65,6 +81,32 @@ def test_framing_two_messages():
     assert buf.messages[1].temperatures[1] == datastrings.BOTH_K_CH2
 
 
+def test_framing_lost_midstream():
+    buf = BufferingThermProto()
+    buf.dataReceived(datastrings.FRAMING_TWOMSGS + datastrings.BAD_UNIT +
+                     datastrings.BOTH_K + datastrings.BOTH_K[:7] +
+                     datastrings.NEGATIVE_14P1 + datastrings.BOTH_K[:3])
+
+    assert len(buf.messages) == 4
+    assert buf._buf == datastrings.BOTH_K[:3]
+    assert buf.messages[2].temperatures[0] == datastrings.BOTH_K_CH1
+    assert buf.messages[3].temperatures[0] == -14.1
+
+
+def test_callback_error_consumes_message():
+    class FailingThermProto(BufferingThermProto):
+        def observation_received(self, observation: Observation):
+            super().observation_received(observation)
+            raise RuntimeError("callback failed")
+
+    buf = FailingThermProto()
+    with pytest.raises(RuntimeError):
+        buf.dataReceived(datastrings.FRAMING_TWOMSGS)
+
+    assert len(buf.messages) == 1
+    assert buf._buf == datastrings.BOTH_K
+
+
 def test_framing_bad_msg():
     buf = BufferingThermProto()
     buf.dataReceived(datastrings.BAD_UNIT)
@@ -79,3 +121,101 @@ def test_csvwriter():
     conv.dataReceived(datastrings.FRAMING_LEADZERO)
     lines = buf.getvalue().splitlines()
     assert len(lines) == 3
+
+
+def test_csvwriter_batch():
+    buf = io.StringIO()
+    conv = ThermometerToCSVProtocol(file_handle=buf, batch_size=2)
+    conv.dataReceived(datastrings.FRAMING_LEADZERO)
+    assert len(buf.getvalue().splitlines()) == 1
+
+    conv.dataReceived(datastrings.FRAMING_TWOMSGS)
+    assert len(buf.getvalue().splitlines()) == 3
+
+    conv.connectionLost()
+    assert len(buf.getvalue().splitlines()) == 4
+
+
+def test_csvwriter_flush_interval():
+    buf = io.StringIO()
+    clock = Clock()
+    conv = ThermometerToCSVProtocol(file_handle=buf, batch_size=16,
+                                    flush_interval=0.5, clock=clock)
+    conv.connectionMade()
+    conv.dataReceived(datastrings.FRAMING_TWOMSGS)
+    assert len(buf.getvalue().splitlines()) == 1
+
+    clock.advance(0.4)
+    assert len(buf.getvalue().splitlines()) == 1
+
+    clock.advance(0.1)
+    assert len(buf.getvalue().splitlines()) == 3
+
+    conv.dataReceived(datastrings.BOTH_K)
+    conv.connectionLost()
+    assert len(buf.getvalue().splitlines()) == 4
+    assert not clock.getDelayedCalls()
+
+
+def test_csvwriter_flush_file():
+    class CountingStringIO(io.StringIO):
+        flushes = 0
+
+        def flush(self):
+            self.flushes += 1
+            super().flush()
+
+    buf = CountingStringIO()
+    clock = Clock()
+    conv = ThermometerToCSVProtocol(file_handle=buf, flush_interval=0.5,
+                                    clock=clock)
+    conv.connectionMade()
+    conv.dataReceived(datastrings.FRAMING_TWOMSGS)
+    assert len(buf.getvalue().splitlines()) == 3
+    assert buf.flushes == 0
+
+    clock.advance(0.5)
+    assert buf.flushes == 1
+
+    conv.flush()
+    assert buf.flushes == 2
+
+    conv.connectionLost()
+    assert buf.flushes == 3
+
+
+def test_csvwriter_subclass():
+    class FilteringCSVProto(ThermometerToCSVProtocol):
+        def __init__(self, file_handle):
+            super().__init__(file_handle=file_handle)
+            self.messages = []
+
+        def observation_received(self, observation: Observation):
+            self.messages.append(observation)
+            if observation.temperature_ch1 < 0:
+                super().observation_received(observation)
+
+    buf = io.StringIO()
+    conv = FilteringCSVProto(file_handle=buf)
+    conv.dataReceived(datastrings.BOTH_K + datastrings.NEGATIVE_14P1)
+
+    assert len(conv.messages) == 2
+    lines = buf.getvalue().splitlines()
+    assert len(lines) == 2
+    assert ",-14.1," in lines[1]
+
+
+def test_csvwriter_binary():
+    buf = io.BytesIO()
+    txt = io.StringIO()
+    conv = ThermometerToCSVProtocol(file_handle=buf)
+    conv_txt = ThermometerToCSVProtocol(file_handle=txt)
+    conv.dataReceived(datastrings.FRAMING_TWOMSGS)
+    conv_txt.dataReceived(datastrings.FRAMING_TWOMSGS)
+
+    lines = buf.getvalue().splitlines()
+    assert len(lines) == 3
+    assert lines[0] == b"system_time,meter_time,thermocouple_type,unit," \
+                       b"temperature_ch1,temperature_ch2"
+    assert lines[1].endswith(b",000:02:34,K,K,295.8,296.5")
+    assert len(txt.getvalue().splitlines()) == 3